@@ -1,18 +1,11 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+import plotly.io as pio
 from io import BytesIO
 import warnings
+import solar_numeric
 warnings.filterwarnings('ignore')
 
 # Configuração da página
@@ -24,7 +17,20 @@ st.set_page_config(
 )
 
 
+# Nomes abreviados dos meses (Jan a Dez)
+MESES_NOMES = ('Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
+               'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez')
+
+# Vida útil típica do sistema fotovoltaico (anos)
+VIDA_UTIL_ANOS = 25
+
+# CSV modelo para download apenas com valores de consumo (conteúdo constante)
+_CSV_MODELO = "Consumo_Mensal_kWh\n" + "\n".join(
+    map(str, [350, 380, 320, 300, 280, 250, 240, 260, 290, 320, 340, 360])
+) + "\n"
+
 # Função para calcular o dimensionamento
+@st.cache_data(max_entries=128, show_spinner=False)
 def calcular_dimensionamento(consumo_mensal, potencia_modulo, irradiacao_solar, 
                            perda_temperatura=0.85, perda_sombreamento=0.95, 
                            perda_conversao=0.92, eficiencia_inversor=0.96):
@@ -32,7 +38,7 @@ def calcular_dimensionamento(consumo_mensal, potencia_modulo, irradiacao_solar,
     Calcula o dimensionamento do sistema fotovoltaico
     
     Parâmetros:
-    - consumo_mensal: lista com consumo de cada mês (kWh)
+    - consumo_mensal: tupla com consumo de cada mês (kWh)
     - potencia_modulo: potência do módulo em Wp
     - irradiacao_solar: valor único de irradiação solar (kWh/m²) - será usado para todos os meses
     - perda_temperatura: fator de perda por temperatura (padrão 0.85)
@@ -43,24 +49,21 @@ def calcular_dimensionamento(consumo_mensal, potencia_modulo, irradiacao_solar,
     # Criar lista de irradiação mensal com o mesmo valor para todos os meses
     irradiacao_mensal = [irradiacao_solar] * 12
     
-    # Consumo médio diário
-    consumo_medio_diario = np.mean(consumo_mensal) / 30
-    
-    # Consumo médio mensal (demanda média dos 12 meses)
-    consumo_medio_mensal = np.mean(consumo_mensal)
-    
     # Fator de desempenho do sistema
     fator_desempenho = perda_temperatura * perda_sombreamento * perda_conversao * eficiencia_inversor
     
-    # Cálculo do número de módulos necessários para atender a demanda média dos 12 meses
-    # Geração diária por módulo (kWh/dia) - usando o valor único de irradiação
-    geracao_diaria_modulo = (potencia_modulo / 1000) * irradiacao_solar * fator_desempenho
-    
-    # Geração mensal por módulo (kWh/mês)
-    geracao_mensal_modulo = geracao_diaria_modulo * 30
+    # Número de módulos necessários para atender a demanda média dos 12 meses
+    # (usando o valor único de irradiação) e geração mensal resultante
+    # O consumo médio é arredondado para que variações numéricas mínimas reaproveitem o cache
+    consumo_medio_mensal = round(solar_numeric.consumo_medio(
+        np.ascontiguousarray(consumo_mensal, dtype=np.float64)
+    ), 6)
+    numero_modulos_final, geracao_mensal_final = solar_numeric.dimensionar(
+        consumo_medio_mensal, float(potencia_modulo), float(irradiacao_solar), fator_desempenho
+    )
     
-    # Número de módulos necessários para atender a demanda média mensal
-    numero_modulos_final = int(np.ceil(consumo_medio_mensal / geracao_mensal_modulo))
+    # Consumo médio diário
+    consumo_medio_diario = consumo_medio_mensal / 30
     
     # Potência total do sistema
     potencia_total = numero_modulos_final * potencia_modulo
@@ -68,12 +71,8 @@ def calcular_dimensionamento(consumo_mensal, potencia_modulo, irradiacao_solar,
     # Dimensionamento do inversor (80-90% da potência do sistema)
     potencia_inversor = potencia_total * 0.85
     
-    # Calcular geração mensal com número final de módulos (usando o mesmo valor de irradiação para todos os meses)
-    geracao_final = []
-    for _ in range(12):
-        geracao_diaria_modulo = (potencia_modulo / 1000) * irradiacao_solar * fator_desempenho
-        geracao_mensal_final = geracao_diaria_modulo * numero_modulos_final * 30
-        geracao_final.append(geracao_mensal_final)
+    # Geração mensal com número final de módulos (mesmo valor de irradiação para todos os meses)
+    geracao_final = np.full(12, geracao_mensal_final, dtype=np.float64)
     
     return {
         'numero_modulos': numero_modulos_final,
@@ -85,13 +84,14 @@ def calcular_dimensionamento(consumo_mensal, potencia_modulo, irradiacao_solar,
     }
 
 # Função para calcular payback
+@st.cache_data(max_entries=128, show_spinner=False)
 def calcular_payback(geracao_mensal, consumo_mensal, tarifa_energia, investimento_total, taxa_desconto=0.0):
     """
     Calcula o tempo de retorno do investimento (payback)
     
     Parâmetros:
-    - geracao_mensal: lista com geração de cada mês (kWh)
-    - consumo_mensal: lista com consumo de cada mês (kWh)
+    - geracao_mensal: array com geração de cada mês (kWh)
+    - consumo_mensal: tupla com consumo de cada mês (kWh)
     - tarifa_energia: tarifa de energia em R$/kWh
     - investimento_total: investimento total do sistema em R$
     - taxa_desconto: taxa de desconto anual (opcional, padrão 0.0)
@@ -101,45 +101,116 @@ def calcular_payback(geracao_mensal, consumo_mensal, tarifa_energia, investiment
     - economia_anual: economia anual em R$
     - economia_mensal_media: economia mensal média em R$
     - payback_descontado: tempo de retorno descontado em anos (se taxa_desconto > 0)
+    - textos: valores monetários já formatados para exibição (tela e PDF)
     """
-    # Calcular economia mensal (energia gerada que não precisa comprar da rede)
-    economia_mensal = []
-    for geracao, consumo in zip(geracao_mensal, consumo_mensal):
-        # Economia é a menor entre geração e consumo (não economiza no excedente)
-        energia_economizada = min(geracao, consumo)
-        economia_mensal.append(energia_economizada * tarifa_energia)
-    
-    economia_mensal_media = np.mean(economia_mensal)
-    economia_anual = sum(economia_mensal)
-    
-    # Payback simples: investimento / economia anual
-    if economia_anual > 0:
-        payback_simples = investimento_total / economia_anual
-    else:
-        payback_simples = float('inf')
-    
-    # Payback descontado (considerando taxa de desconto)
-    payback_descontado = None
-    if taxa_desconto > 0 and economia_anual > 0:
-        taxa_mensal = taxa_desconto / 12
-        valor_presente_acumulado = 0
-        meses = 0
-        while valor_presente_acumulado < investimento_total and meses < 50 * 12:  # Limite de 50 anos
-            meses += 1
-            economia_mes = economia_mensal[(meses - 1) % 12]  # Repetir padrão anual
-            valor_presente = economia_mes / ((1 + taxa_mensal) ** meses)
-            valor_presente_acumulado += valor_presente
-        payback_descontado = meses / 12 if meses < 50 * 12 else None
+    # Núcleo numérico compilado (arrays contíguos evitam conversões na chamada)
+    payback_simples, payback_descontado, economia_mensal = solar_numeric.payback(
+        np.ascontiguousarray(geracao_mensal, dtype=np.float64),
+        np.ascontiguousarray(consumo_mensal, dtype=np.float64),
+        float(tarifa_energia),
+        float(investimento_total),
+        float(taxa_desconto)
+    )
+    economia_anual = float(economia_mensal.sum())
+    economia_mensal_media = float(economia_mensal.mean())
+    
+    # Economia e lucro ao longo da vida útil típica do sistema
+    economia_vida_util = economia_anual * VIDA_UTIL_ANOS
+    lucro_liquido = economia_vida_util - investimento_total
     
     return {
         'payback_simples': payback_simples,
         'economia_anual': economia_anual,
         'economia_mensal_media': economia_mensal_media,
-        'economia_mensal': economia_mensal,
-        'payback_descontado': payback_descontado
+        'economia_mensal': economia_mensal.tolist(),
+        'payback_descontado': None if np.isnan(payback_descontado) else payback_descontado,
+        'textos': {
+            'economia_anual': f'R$ {economia_anual:,.2f}',
+            'economia_mensal_media': f'R$ {economia_mensal_media:,.2f}',
+            'economia_vida_util': f'R$ {economia_vida_util:,.2f}',
+            'lucro_liquido': f'R$ {lucro_liquido:,.2f}'
+        }
+    }
+
+# Recursos compartilhados (criados uma vez por processo)
+@st.cache_resource
+def _template_plotly():
+    """Template do Plotly usado em todos os gráficos"""
+    return pio.templates['plotly_white']
+
+def _estilo_tabela(fundo_corpo, alinhamento='LEFT', fonte_cabecalho=12, fonte_corpo=None,
+                   linhas_alternadas=False):
+    """Cria o estilo padrão das tabelas: cabeçalho cinza, corpo colorido e grade"""
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+    
+    comandos = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), alinhamento),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), fonte_cabecalho)
+    ]
+    if fonte_corpo is not None:
+        comandos.append(('FONTSIZE', (0, 1), (-1, -1), fonte_corpo))
+    comandos += [
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), fundo_corpo),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]
+    if linhas_alternadas:
+        comandos.append(('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]))
+    return TableStyle(comandos)
+
+@st.cache_resource
+def _estilos_pdf():
+    """Estilos de parágrafo e de tabela usados no relatório em PDF"""
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    
+    styles = getSampleStyleSheet()
+    
+    # Estilos personalizados
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1f77b4'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+    
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#2c3e50'),
+        spaceAfter=12,
+        spaceBefore=12
+    )
+    
+    # Estilos das tabelas (reutilizados a cada geração)
+    tabelas = {
+        'beige': _estilo_tabela(colors.beige),
+        'lightblue': _estilo_tabela(colors.lightblue),
+        'lightgreen': _estilo_tabela(colors.lightgreen),
+        'lightyellow': _estilo_tabela(colors.lightyellow),
+        'mensal': _estilo_tabela(colors.white, 'CENTER', fonte_cabecalho=9, fonte_corpo=8,
+                                 linhas_alternadas=True),
+        'economia': _estilo_tabela(colors.lightgreen, 'CENTER', fonte_cabecalho=10, fonte_corpo=9,
+                                   linhas_alternadas=True)
+    }
+    
+    return {
+        'base': styles,
+        'titulo': title_style,
+        'cabecalho': heading_style,
+        'tabelas': tabelas
     }
 
 # Função para criar gráficos
+@st.cache_data(max_entries=128, show_spinner=False)
 def criar_graficos(consumo_mensal, geracao_mensal, meses):
     """Cria gráficos comparativos entre consumo e geração"""
     
@@ -167,11 +238,12 @@ def criar_graficos(consumo_mensal, geracao_mensal, meses):
         xaxis_title='Mês',
         yaxis_title='Energia (kWh)',
         hovermode='x unified',
-        template='plotly_white'
+        template=_template_plotly()
     )
     
     return fig
 
+@st.cache_data(max_entries=128, show_spinner=False)
 def criar_grafico_barras(consumo_mensal, geracao_mensal, meses):
     """Cria gráfico de barras comparativo"""
     
@@ -198,17 +270,22 @@ def criar_grafico_barras(consumo_mensal, geracao_mensal, meses):
         xaxis_title='Mês',
         yaxis_title='Energia (kWh)',
         barmode='group',
-        template='plotly_white'
+        template=_template_plotly()
     )
     
     return fig
 
+@st.cache_data(max_entries=128, show_spinner=False)
 def criar_grafico_excedente(consumo_mensal, geracao_mensal, meses):
     """Cria gráfico específico de excedente e déficit de energia"""
     
-    saldo = np.array(geracao_mensal) - np.array(consumo_mensal)
-    excedente = np.where(saldo > 0, saldo, 0)
-    deficit = np.where(saldo < 0, saldo, 0)
+    saldo = np.asarray(geracao_mensal, dtype=np.float64) - np.asarray(consumo_mensal, dtype=np.float64)
+    excedente = np.clip(saldo, 0, None)
+    deficit = np.clip(saldo, None, 0)
+    
+    # Rótulos das barras (vazios nos meses sem excedente/déficit)
+    texto_excedente = np.where(excedente > 0, np.char.add('+', np.char.mod('%.1f', excedente)), '')
+    texto_deficit = np.where(deficit < 0, np.char.mod('%.1f', deficit), '')
     
     fig = go.Figure()
     
@@ -219,7 +296,7 @@ def criar_grafico_excedente(consumo_mensal, geracao_mensal, meses):
         y=excedente,
         marker_color='green',
         opacity=0.7,
-        text=[f'+{val:.1f}' if val > 0 else '' for val in excedente],
+        text=texto_excedente,
         textposition='outside'
     ))
     
@@ -230,7 +307,7 @@ def criar_grafico_excedente(consumo_mensal, geracao_mensal, meses):
         y=deficit,
         marker_color='red',
         opacity=0.7,
-        text=[f'{val:.1f}' if val < 0 else '' for val in deficit],
+        text=texto_deficit,
         textposition='outside'
     ))
     
@@ -242,67 +319,81 @@ def criar_grafico_excedente(consumo_mensal, geracao_mensal, meses):
         xaxis_title='Mês',
         yaxis_title='Saldo de Energia (kWh)',
         barmode='overlay',
-        template='plotly_white',
+        template=_template_plotly(),
         hovermode='x unified'
     )
     
     return fig
 
-# Função para gerar PDF
+@st.cache_data(max_entries=128, show_spinner=False)
+def criar_grafico_economia(economia_mensal, meses):
+    """Cria gráfico de barras da economia mensal estimada"""
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=meses,
+        y=economia_mensal,
+        marker_color='green',
+        opacity=0.7,
+        text=[f'R$ {val:.2f}' for val in economia_mensal],
+        textposition='outside'
+    ))
+    
+    fig.update_layout(
+        title='Economia Mensal Estimada',
+        xaxis_title='Mês',
+        yaxis_title='Economia (R$)',
+        template=_template_plotly(),
+        uirevision='economia'
+    )
+    
+    return fig
+
+# Função para gerar PDF (cacheada: mesmas entradas devolvem os mesmos bytes)
+@st.cache_data(max_entries=32, show_spinner=False)
 def gerar_pdf(consumo_mensal, resultado, meses, potencia_modulo, irradiacao_solar,
                resultado_payback=None, investimento_total=0, tarifa_energia=0):
     """
     Gera um relatório em PDF com os resultados do dimensionamento
+    
+    Retorna o conteúdo do PDF em bytes (aceito diretamente pelo st.download_button)
     """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer, PageBreak
+    
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=30, leftMargin=30, 
                            topMargin=30, bottomMargin=18)
     story = []
-    styles = getSampleStyleSheet()
-    
-    # Estilos personalizados
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1f77b4'),
-        spaceAfter=30,
-        alignment=TA_CENTER
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=colors.HexColor('#2c3e50'),
-        spaceAfter=12,
-        spaceBefore=12
-    )
+    estilos = _estilos_pdf()
+    styles = estilos['base']
+    title_style = estilos['titulo']
+    heading_style = estilos['cabecalho']
+    tabelas = estilos['tabelas']
     
     # Título
     story.append(Paragraph("Relatório de Dimensionamento do Sistema Fotovoltaico", title_style))
     story.append(Spacer(1, 0.2*inch))
     
+    # Totais reutilizados nas tabelas
+    consumo_arr = np.asarray(consumo_mensal, dtype=np.float64)
+    geracao_arr = resultado['geracao_mensal']
+    consumo_total = consumo_arr.sum()
+    geracao_total = geracao_arr.sum()
+    
     # Dados de entrada
     story.append(Paragraph("Dados de Entrada", heading_style))
     dados_entrada = [
         ['Parâmetro', 'Valor'],
         ['Potência do Módulo', f'{potencia_modulo} Wp'],
         ['Irradiação Solar', f'{irradiacao_solar} kWh/m²'],
-        ['Consumo Médio Mensal', f'{np.mean(consumo_mensal):.1f} kWh'],
-        ['Consumo Total Anual', f'{sum(consumo_mensal):.1f} kWh']
+        ['Consumo Médio Mensal', f'{consumo_arr.mean():.1f} kWh'],
+        ['Consumo Total Anual', f'{consumo_total:.1f} kWh']
     ]
     t = Table(dados_entrada, colWidths=[3*inch, 2*inch])
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
+    t.setStyle(tabelas['beige'])
     story.append(t)
     story.append(Spacer(1, 0.3*inch))
     
@@ -317,48 +408,27 @@ def gerar_pdf(consumo_mensal, resultado, meses, potencia_modulo, irradiacao_sola
         ['Fator de Desempenho', f"{resultado['fator_desempenho']:.3f}"]
     ]
     t = Table(resultados_principais, colWidths=[3*inch, 2*inch])
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.lightblue),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
+    t.setStyle(tabelas['lightblue'])
     story.append(t)
     story.append(Spacer(1, 0.3*inch))
     
     # Tabela mensal
     story.append(Paragraph("Análise Mensal", heading_style))
-    dados_mensais = [['Mês', 'Consumo (kWh)', 'Geração (kWh)', 'Saldo (kWh)', 'Cobertura (%)']]
-    for i, mes in enumerate(meses):
-        consumo = consumo_mensal[i]
-        geracao = resultado['geracao_mensal'][i]
-        saldo = geracao - consumo
-        cobertura = (geracao / consumo * 100) if consumo > 0 else 0
-        dados_mensais.append([
-            mes,
-            f'{consumo:.1f}',
-            f'{geracao:.1f}',
-            f'{saldo:.1f}',
-            f'{cobertura:.1f}'
-        ])
+    saldo_arr = geracao_arr - consumo_arr
+    cobertura_arr = np.divide(geracao_arr, consumo_arr, out=np.zeros_like(geracao_arr),
+                              where=consumo_arr > 0) * 100
+    linhas = np.column_stack([
+        np.asarray(meses),
+        np.char.mod('%.1f', consumo_arr),
+        np.char.mod('%.1f', geracao_arr),
+        np.char.mod('%.1f', saldo_arr),
+        np.char.mod('%.1f', cobertura_arr)
+    ])
+    dados_mensais = [['Mês', 'Consumo (kWh)', 'Geração (kWh)', 'Saldo (kWh)', 'Cobertura (%)']] + linhas.tolist()
+    cobertura_media = cobertura_arr.mean()
     
     t = Table(dados_mensais, colWidths=[0.8*inch, 1.2*inch, 1.2*inch, 1.2*inch, 1.2*inch])
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 9),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-    ]))
+    t.setStyle(tabelas['mensal'])
     story.append(t)
     story.append(Spacer(1, 0.3*inch))
     
@@ -366,22 +436,13 @@ def gerar_pdf(consumo_mensal, resultado, meses, potencia_modulo, irradiacao_sola
     story.append(Paragraph("Resumo Anual", heading_style))
     resumo_anual = [
         ['Indicador', 'Valor'],
-        ['Consumo Total', f'{sum(consumo_mensal):.1f} kWh/ano'],
-        ['Geração Total', f'{sum(resultado["geracao_mensal"]):.1f} kWh/ano'],
-        ['Saldo Anual', f'{sum(resultado["geracao_mensal"]) - sum(consumo_mensal):.1f} kWh'],
-        ['Cobertura Média', f'{np.mean([(g/c*100) if c > 0 else 0 for g, c in zip(resultado["geracao_mensal"], consumo_mensal)]):.1f}%']
+        ['Consumo Total', f'{consumo_total:.1f} kWh/ano'],
+        ['Geração Total', f'{geracao_total:.1f} kWh/ano'],
+        ['Saldo Anual', f'{geracao_total - consumo_total:.1f} kWh'],
+        ['Cobertura Média', f'{cobertura_media:.1f}%']
     ]
     t = Table(resumo_anual, colWidths=[3*inch, 2*inch])
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.lightgreen),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
+    t.setStyle(tabelas['lightgreen'])
     story.append(t)
     
     # Análise de Payback (se disponível)
@@ -393,8 +454,8 @@ def gerar_pdf(consumo_mensal, resultado, meses, potencia_modulo, irradiacao_sola
             ['Parâmetro', 'Valor'],
             ['Investimento Total', f'R$ {investimento_total:,.2f}'],
             ['Tarifa de Energia', f'R$ {tarifa_energia:.4f}/kWh'],
-            ['Economia Anual', f'R$ {resultado_payback["economia_anual"]:,.2f}'],
-            ['Economia Mensal Média', f'R$ {resultado_payback["economia_mensal_media"]:,.2f}']
+            ['Economia Anual', resultado_payback['textos']['economia_anual']],
+            ['Economia Mensal Média', resultado_payback['textos']['economia_mensal_media']]
         ]
         
         if resultado_payback['payback_simples'] != float('inf'):
@@ -407,47 +468,23 @@ def gerar_pdf(consumo_mensal, resultado, meses, potencia_modulo, irradiacao_sola
             meses_desc = int((resultado_payback['payback_descontado'] - anos_desc) * 12)
             payback_dados.append(['Payback Descontado', f'{anos_desc} anos e {meses_desc} meses'])
         
-        economia_25_anos = resultado_payback['economia_anual'] * 25
-        lucro_liquido = economia_25_anos - investimento_total
-        payback_dados.append(['Economia em 25 anos', f'R$ {economia_25_anos:,.2f}'])
-        payback_dados.append(['Lucro Líquido (25 anos)', f'R$ {lucro_liquido:,.2f}'])
+        payback_dados.append([f'Economia em {VIDA_UTIL_ANOS} anos', resultado_payback['textos']['economia_vida_util']])
+        payback_dados.append([f'Lucro Líquido ({VIDA_UTIL_ANOS} anos)', resultado_payback['textos']['lucro_liquido']])
         
         t = Table(payback_dados, colWidths=[3*inch, 2*inch])
-        t.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.lightyellow),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        t.setStyle(tabelas['lightyellow'])
         story.append(t)
         story.append(Spacer(1, 0.3*inch))
         
         # Tabela de economia mensal
         story.append(Paragraph("Economia Mensal Estimada", heading_style))
-        economia_mensal_dados = [['Mês', 'Economia (R$)']]
-        for i, mes in enumerate(meses):
-            economia_mensal_dados.append([
-                mes,
-                f'R$ {resultado_payback["economia_mensal"][i]:,.2f}'
-            ])
+        economia_mensal_dados = [['Mês', 'Economia (R$)']] + [
+            [mes, f'R$ {economia:,.2f}']
+            for mes, economia in zip(meses, resultado_payback['economia_mensal'])
+        ]
         
         t = Table(economia_mensal_dados, colWidths=[1*inch, 2*inch])
-        t.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgreen),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-        ]))
+        t.setStyle(tabelas['economia'])
         story.append(t)
     
     # Rodapé
@@ -457,8 +494,250 @@ def gerar_pdf(consumo_mensal, resultado, meses, potencia_modulo, irradiacao_sola
     
     # Construir PDF
     doc.build(story)
-    buffer.seek(0)
-    return buffer
+    return buffer.getvalue()
+
+# Leitura do CSV de consumo (cacheada pelo conteúdo do arquivo)
+@st.cache_data(show_spinner=False)
+def _processar_csv(conteudo):
+    """
+    Lê o CSV enviado e extrai os 12 valores de consumo mensal
+    
+    Retorna um array com 12 valores (kWh) ou None se o arquivo não tiver dados válidos
+    """
+    df_csv = pd.read_csv(BytesIO(conteudo))
+    
+    # Procurar por colunas com nomes relacionados
+    colunas = [col.lower().strip() for col in df_csv.columns]
+    
+    # Identificar coluna de consumo
+    consumo_col = None
+    for idx, col in enumerate(colunas):
+        if 'consumo' in col or 'consum' in col:
+            consumo_col = df_csv.columns[idx]
+            break
+    
+    # Processar consumo mensal
+    if consumo_col:
+        valores = pd.to_numeric(df_csv[consumo_col], errors='coerce').to_numpy(dtype=np.float64)
+        # Filtrar valores válidos (remover NaN e valores muito grandes)
+        valores = valores[np.isfinite(valores) & (valores >= 0) & (valores < 10000)][:12]
+        if len(valores) > 0:
+            # Completar com zeros os meses que faltarem
+            return np.pad(valores, (0, 12 - len(valores)), constant_values=0.0)
+    elif len(df_csv.columns) > 0:
+        # Se não encontrou coluna específica, tentar primeira coluna numérica
+        valores = pd.to_numeric(df_csv.iloc[:, 0], errors='coerce').to_numpy(dtype=np.float64)
+        valores = valores[np.isfinite(valores) & (valores >= 0) & (valores < 10000)]
+        if len(valores) >= 12:
+            return valores[:12]
+    return None
+
+# Renderização dos resultados (fragmento: reexecuta só esta parte da página)
+@st.fragment
+def _render_resultados():
+    """Exibe métricas, tabelas e gráficos do último dimensionamento calculado"""
+    resultado = st.session_state.ultimo_resultado
+    consumo_mensal, meses = st.session_state.ultimas_entradas
+    potencia_modulo, irradiacao_solar = st.session_state.ultimos_parametros[:2]
+    
+    # Exibir resultados principais
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            "Número de Módulos", 
+            f"{resultado['numero_modulos']}",
+            help="Quantidade de módulos fotovoltaicos necessários"
+        )
+    
+    with col2:
+        st.metric(
+            "Potência Total", 
+            f"{resultado['potencia_total']:.0f} Wp",
+            help="Potência total do sistema fotovoltaico"
+        )
+    
+    with col3:
+        st.metric(
+            "Potência do Inversor", 
+            f"{resultado['potencia_inversor']:.0f} W",
+            help="Potência recomendada para o inversor"
+        )
+    
+    with col4:
+        st.metric(
+            "Consumo Médio Diário", 
+            f"{resultado['consumo_medio_diario']:.1f} kWh/dia",
+            help="Consumo médio diário de energia"
+        )
+    
+    # Séries mensais mantidas como arrays (estatísticas não passam pelo pandas)
+    geracao_arr = resultado['geracao_mensal']
+    consumo_arr = np.asarray(consumo_mensal, dtype=np.float64)
+    saldo_arr = geracao_arr - consumo_arr
+    # Cobertura arredondada como na tabela (a média exibida é a média da coluna)
+    cobertura_arr = (geracao_arr / consumo_arr * 100).round(1)
+    
+    # Tabela de resultados mensais (DataFrame criado apenas para exibição)
+    st.subheader("📋 Resultados Mensais")
+    st.dataframe(pd.DataFrame({
+        'Mês': meses,
+        'Consumo (kWh)': consumo_arr,
+        'Geração (kWh)': geracao_arr,
+        'Saldo (kWh)': saldo_arr,
+        'Cobertura (%)': cobertura_arr
+    }), use_container_width=True)
+    
+    # Gráficos
+    st.subheader("📈 Visualizações")
+    
+    # Gráfico de linha comparativo
+    fig_linha = criar_graficos(consumo_mensal, resultado['geracao_mensal'], meses)
+    st.plotly_chart(fig_linha, use_container_width=True)
+    
+    # Gráfico de excedente de energia
+    st.subheader("⚡ Excedente e Déficit de Energia")
+    fig_excedente = criar_grafico_excedente(consumo_mensal, resultado['geracao_mensal'], meses)
+    st.plotly_chart(fig_excedente, use_container_width=True)
+    
+    # Análise de cenários
+    st.subheader("🔍 Análise de Cenários")
+    
+    st.write("**Cenários com diferentes quantidades de módulos:**")
+    
+    cenarios = resultado['numero_modulos'] + np.arange(3)
+    
+    # Geração média de cada cenário (mesmo valor de irradiação solar para todos os meses)
+    geracao_por_modulo = (potencia_modulo / 1000) * irradiacao_solar * resultado['fator_desempenho'] * 30
+    geracao_medias = geracao_por_modulo * cenarios
+    
+    df_cenarios = pd.DataFrame({
+        'Cenário': [f'{i} módulos' for i in cenarios],
+        'Módulos': cenarios,
+        'Potência Total (Wp)': cenarios * potencia_modulo,
+        'Geração Média Mensal (kWh)': np.char.mod('%.1f', geracao_medias)
+    })
+    
+    st.dataframe(df_cenarios, use_container_width=True)
+    
+    # Estatísticas do sistema
+    st.subheader("📊 Estatísticas do Sistema")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        consumo_total = consumo_arr.sum()
+        geracao_total = geracao_arr.sum()
+        # Um único bloco markdown por coluna (menos mensagens enviadas ao navegador)
+        st.markdown("\n".join([
+            "**Resumo Anual:**",
+            "",
+            f"- Consumo Total: {consumo_total:.1f} kWh/ano",
+            f"- Geração Total: {geracao_total:.1f} kWh/ano",
+            f"- Saldo Anual: {saldo_arr.sum():.1f} kWh",
+            f"- Cobertura Média: {cobertura_arr.mean():.1f}%",
+        ]))
+    
+    with col2:
+        st.markdown("\n".join([
+            "**Fator de Desempenho do Sistema:**",
+            "",
+            f"- Fator Total: {resultado['fator_desempenho']:.3f}",
+            "- Considera perdas por temperatura, sombreamento, conversão e eficiência do inversor",
+        ]))
+
+# Análise de Payback (fragmento próprio: depende apenas das entradas econômicas)
+@st.fragment
+def _render_payback():
+    """Exibe payback, economia mensal e resumo financeiro do último cálculo"""
+    resultado = st.session_state.ultimo_resultado
+    resultado_payback = st.session_state.ultimo_payback
+    investimento_total, tarifa_energia, taxa_desconto = st.session_state.ultimos_parametros[3:]
+    
+    # Payback só é calculado quando há investimento e tarifa informados
+    if resultado_payback is None:
+        return
+    
+    st.subheader("💰 Análise de Retorno do Investimento (Payback)")
+    
+    kwp = resultado['potencia_total'] / 1000.0
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        if resultado_payback['payback_simples'] != float('inf'):
+            anos = int(resultado_payback['payback_simples'])
+            meses_payback = int((resultado_payback['payback_simples'] - anos) * 12)
+            st.metric(
+                "Payback Simples",
+                f"{anos} anos e {meses_payback} meses",
+                help="Tempo necessário para recuperar o investimento"
+            )
+        else:
+            st.metric("Payback Simples", "Não viável", help="Economia insuficiente")
+    
+    with col2:
+        st.metric(
+            "Economia Anual",
+            resultado_payback['textos']['economia_anual'],
+            help="Economia anual estimada com o sistema"
+        )
+    
+    with col3:
+        st.metric(
+            "Economia Mensal Média",
+            resultado_payback['textos']['economia_mensal_media'],
+            help="Economia mensal média estimada"
+        )
+    
+    with col4:
+        if resultado_payback['payback_descontado'] is not None:
+            anos_desc = int(resultado_payback['payback_descontado'])
+            meses_desc = int((resultado_payback['payback_descontado'] - anos_desc) * 12)
+            st.metric(
+                "Payback Descontado",
+                f"{anos_desc} anos e {meses_desc} meses",
+                help="Payback considerando taxa de desconto"
+            )
+        elif taxa_desconto > 0:
+            st.metric("Payback Descontado", "> 50 anos", help="Payback muito longo")
+    
+    # Gráfico de economia mensal
+    st.subheader("📊 Economia Mensal Estimada")
+    fig_economia = criar_grafico_economia(tuple(resultado_payback['economia_mensal']), MESES_NOMES)
+    st.plotly_chart(fig_economia, use_container_width=True)
+    
+    # Resumo financeiro
+    st.subheader("💵 Resumo Financeiro")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Linhas acumuladas e enviadas em um único bloco markdown por coluna
+        linhas = [
+            "**Investimento e Retorno:**",
+            "",
+            f"- Investimento Total: R$ {investimento_total:,.2f}",
+            f"- Economia Anual: {resultado_payback['textos']['economia_anual']}",
+        ]
+        if resultado_payback['payback_simples'] != float('inf'):
+            linhas.append(f"- Payback: {resultado_payback['payback_simples']:.2f} anos")
+            # Economia e lucro ao longo da vida útil típica
+            linhas.append(f"- Economia em {VIDA_UTIL_ANOS} anos: {resultado_payback['textos']['economia_vida_util']}")
+            linhas.append(f"- Lucro Líquido ({VIDA_UTIL_ANOS} anos): {resultado_payback['textos']['lucro_liquido']}")
+        st.markdown("\n".join(linhas))
+    
+    with col2:
+        linhas = [
+            "**Informações Adicionais:**",
+            "",
+            f"- Tarifa de Energia: R$ {tarifa_energia:.4f}/kWh",
+        ]
+        if taxa_desconto > 0:
+            linhas.append(f"- Taxa de Desconto: {taxa_desconto:.2f}% ao ano")
+            if resultado_payback['payback_descontado'] is not None:
+                linhas.append(f"- Payback Descontado: {resultado_payback['payback_descontado']:.2f} anos")
+        linhas.append(f"- Custo por kWp: R$ {investimento_total / kwp:,.2f}/kWp")
+        st.markdown("\n".join(linhas))
 
 # Interface principal
 def main():
@@ -479,21 +758,14 @@ def main():
     
     # Consumo mensal
     st.sidebar.subheader("Consumo Mensal (kWh)")
-    meses = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 
-             'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+    meses = MESES_NOMES
     
     # Opção de upload de CSV
     st.sidebar.markdown("**Opção 1: Upload de CSV**")
     
-    # Criar CSV modelo para download apenas com valores de consumo
-    csv_modelo = pd.DataFrame({
-        'Consumo_Mensal_kWh': [350, 380, 320, 300, 280, 250, 240, 260, 290, 320, 340, 360]
-    })
-    csv_string = csv_modelo.to_csv(index=False)
-    
     st.sidebar.download_button(
         label="📥 Baixar Modelo CSV",
-        data=csv_string,
+        data=_CSV_MODELO,
         file_name="modelo_consumo_mensal.csv",
         mime="text/csv",
         help="Baixe este arquivo modelo. O CSV deve ter apenas uma coluna com os valores de consumo (12 linhas, uma para cada mês: Jan a Dez)."
@@ -507,8 +779,10 @@ def main():
     )
     
     # Inicializar session_state se não existir
-    if 'consumo_mensal' not in st.session_state:
-        st.session_state.consumo_mensal = [300.0] * 12
+    # Série base do editor de consumo: definida apenas na inicialização e ao carregar um CSV
+    # (o data_editor identifica o widget pelos dados de entrada, que não podem mudar a cada edição)
+    if 'consumo_base' not in st.session_state:
+        st.session_state.consumo_base = [300.0] * 12
     if 'potencia_modulo' not in st.session_state:
         st.session_state.potencia_modulo = 400.0
     if 'irradiacao_solar' not in st.session_state:
@@ -524,36 +798,9 @@ def main():
     if uploaded_file is not None and st.session_state.csv_file_id != csv_file_id_atual:
         try:
             # Tentar ler o CSV
-            df_csv = pd.read_csv(uploaded_file)
-            
-            # Procurar por colunas com nomes relacionados
-            colunas = [col.lower().strip() for col in df_csv.columns]
-            
-            # Identificar coluna de consumo
-            consumo_col = None
-            for idx, col in enumerate(colunas):
-                if 'consumo' in col or 'consum' in col:
-                    consumo_col = df_csv.columns[idx]
-                    break
-            
-            # Processar consumo mensal
-            if consumo_col:
-                valores = pd.to_numeric(df_csv[consumo_col], errors='coerce').dropna().values
-                # Filtrar valores válidos (remover NaN e valores muito grandes)
-                valores = valores[(valores >= 0) & (valores < 10000)]
-                if len(valores) >= 12:
-                    st.session_state.consumo_mensal = valores[:12].tolist()
-                elif len(valores) > 0:
-                    consumo_temp = valores.tolist()
-                    while len(consumo_temp) < 12:
-                        consumo_temp.append(0.0)
-                    st.session_state.consumo_mensal = consumo_temp
-            elif len(df_csv.columns) > 0:
-                # Se não encontrou coluna específica, tentar primeira coluna numérica
-                valores = pd.to_numeric(df_csv.iloc[:, 0], errors='coerce').dropna().values
-                valores = valores[(valores >= 0) & (valores < 10000)]
-                if len(valores) >= 12:
-                    st.session_state.consumo_mensal = valores[:12].tolist()
+            consumo_csv = _processar_csv(uploaded_file.getvalue())
+            if consumo_csv is not None:
+                st.session_state.consumo_base = consumo_csv.tolist()
             
             st.sidebar.success(f"✅ CSV carregado com sucesso!")
             st.session_state.csv_file_id = csv_file_id_atual
@@ -564,40 +811,39 @@ def main():
     # Opção de entrada manual
     st.sidebar.markdown("**Opção 2: Entrada Manual**")
     
-    # Campos de entrada manual (podem ser editados mesmo com CSV carregado)
-    # Usar uma chave única baseada no arquivo CSV para forçar atualização dos campos
+    # Tabela de entrada manual (pode ser editada mesmo com CSV carregado)
+    # Usar uma chave única baseada no arquivo CSV para recriar a tabela quando um CSV é carregado
     key_suffix = st.session_state.csv_file_id if st.session_state.csv_file_id else "manual"
     
-    consumo_mensal = []
-    for i, mes in enumerate(meses):
-        # Usar valor do session_state
-        valor_padrao = float(st.session_state.consumo_mensal[i]) if i < len(st.session_state.consumo_mensal) else 300.0
-        
-        # Usar chave única que muda quando CSV é carregado para forçar atualização
-        valor = st.sidebar.number_input(
-            f"{mes}:", 
-            min_value=0.0, 
-            value=valor_padrao, 
-            step=10.0,
-            key=f"consumo_{i}_{key_suffix}"
-        )
-        consumo_mensal.append(valor)
-        
-        # Atualizar session_state quando o usuário edita manualmente
-        st.session_state.consumo_mensal[i] = valor
+    df_consumo = pd.DataFrame({
+        'Mês': meses,
+        'Consumo (kWh)': np.asarray(st.session_state.consumo_base, dtype=np.float64)
+    })
+    df_consumo_editado = st.sidebar.data_editor(
+        df_consumo,
+        hide_index=True,
+        num_rows='fixed',
+        disabled=['Mês'],
+        column_config={
+            'Consumo (kWh)': st.column_config.NumberColumn(
+                min_value=0.0, step=0.1, format='%.1f', required=True
+            )
+        },
+        use_container_width=True,
+        key=f"consumo_editor_{key_suffix}"
+    )
+    # Valores atuais lidos do retorno do editor (não são gravados de volta na série base)
+    consumo_mensal = df_consumo_editado['Consumo (kWh)'].to_numpy(dtype=np.float64).tolist()
     
     # Parâmetros do sistema
     st.sidebar.subheader("Parâmetros do Sistema")
     
-    # Usar chave única baseada no arquivo CSV para forçar atualização
-    key_suffix = st.session_state.csv_file_id if st.session_state.csv_file_id else "manual"
-    
     potencia_modulo = st.sidebar.number_input(
         "Potência do Módulo (Wp):", 
         min_value=100, 
         value=int(st.session_state.potencia_modulo), 
         step=50,
-        key=f"potencia_{key_suffix}"
+        key="potencia_input"
     )
     st.session_state.potencia_modulo = float(potencia_modulo)
     
@@ -607,7 +853,7 @@ def main():
         value=float(st.session_state.irradiacao_solar), 
         step=0.1,
         help="Valor médio de irradiação solar diária (será usado para todos os meses)",
-        key=f"irradiacao_{key_suffix}"
+        key="irradiacao_input"
     )
     st.session_state.irradiacao_solar = float(irradiacao_solar)
     
@@ -641,7 +887,7 @@ def main():
             value=float(st.session_state.investimento_total), 
             step=1000.0,
             help="Custo total do sistema fotovoltaico",
-            key=f"investimento_{key_suffix}"
+            key="investimento_input"
         )
         st.session_state.investimento_total = float(investimento_total)
         
@@ -651,7 +897,7 @@ def main():
             value=float(st.session_state.tarifa_energia), 
             step=0.01,
             help="Tarifa de energia elétrica cobrada pela concessionária",
-            key=f"tarifa_{key_suffix}"
+            key="tarifa_input"
         )
         st.session_state.tarifa_energia = float(tarifa_energia)
         
@@ -662,251 +908,81 @@ def main():
             value=float(st.session_state.taxa_desconto), 
             step=0.5,
             help="Taxa de desconto para cálculo de payback descontado (opcional)",
-            key=f"taxa_desconto_{key_suffix}"
+            key="taxa_desconto_input"
         )
         st.session_state.taxa_desconto = float(taxa_desconto)
     
     # Botão para calcular
     if st.sidebar.button("🔧 Calcular Dimensionamento", type="primary"):
         # Realizar cálculos com valores padrão de fatores de perda
+        # Tuplas tornam as entradas estáveis para o cache do Streamlit
+        consumo_mensal = tuple(consumo_mensal)
         resultado = calcular_dimensionamento(
             consumo_mensal, potencia_modulo, irradiacao_solar
         )
         
-        # Exibir resultados principais
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric(
-                "Número de Módulos", 
-                f"{resultado['numero_modulos']}",
-                help="Quantidade de módulos fotovoltaicos necessários"
-            )
-        
-        with col2:
-            st.metric(
-                "Potência Total", 
-                f"{resultado['potencia_total']:.0f} Wp",
-                help="Potência total do sistema fotovoltaico"
-            )
-        
-        with col3:
-            st.metric(
-                "Potência do Inversor", 
-                f"{resultado['potencia_inversor']:.0f} W",
-                help="Potência recomendada para o inversor"
-            )
-        
-        with col4:
-            st.metric(
-                "Consumo Médio Diário", 
-                f"{resultado['consumo_medio_diario']:.1f} kWh/dia",
-                help="Consumo médio diário de energia"
-            )
-        
-        # Tabela de resultados mensais
-        st.subheader("📋 Resultados Mensais")
-        
-        df_resultados = pd.DataFrame({
-            'Mês': meses,
-            'Consumo (kWh)': consumo_mensal,
-            'Geração (kWh)': resultado['geracao_mensal'],
-            'Saldo (kWh)': np.array(resultado['geracao_mensal']) - np.array(consumo_mensal),
-            'Cobertura (%)': (np.array(resultado['geracao_mensal']) / np.array(consumo_mensal) * 100).round(1)
-        })
-        
-        st.dataframe(df_resultados, use_container_width=True)
-        
-        # Gráficos
-        st.subheader("📈 Visualizações")
-        
-        # Gráfico de linha comparativo
-        fig_linha = criar_graficos(consumo_mensal, resultado['geracao_mensal'], meses)
-        st.plotly_chart(fig_linha, use_container_width=True)
-        
-        # Gráfico de excedente de energia
-        st.subheader("⚡ Excedente e Déficit de Energia")
-        fig_excedente = criar_grafico_excedente(consumo_mensal, resultado['geracao_mensal'], meses)
-        st.plotly_chart(fig_excedente, use_container_width=True)
-        
-        # Análise de cenários
-        st.subheader("🔍 Análise de Cenários")
-        
-        st.write("**Cenários com diferentes quantidades de módulos:**")
-        
-        cenarios = [resultado['numero_modulos'], resultado['numero_modulos'] + 1, resultado['numero_modulos'] + 2]
-        
-        # Calcular geração média para cada cenário antes de criar o DataFrame
-        geracao_media_lista = []
-        for cenario in cenarios:
-            # Usar o valor único de irradiação solar para todos os meses
-            geracao_media = (potencia_modulo / 1000) * irradiacao_solar * resultado['fator_desempenho'] * cenario * 30
-            geracao_media_lista.append(f"{geracao_media:.1f}")
-        
-        df_cenarios = pd.DataFrame({
-            'Cenário': [f'{i} módulos' for i in cenarios],
-            'Módulos': cenarios,
-            'Potência Total (Wp)': [i * potencia_modulo for i in cenarios],
-            'Geração Média Mensal (kWh)': geracao_media_lista
-        })
-        
-        st.dataframe(df_cenarios, use_container_width=True)
-        
-        # Estatísticas do sistema
-        st.subheader("📊 Estatísticas do Sistema")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.write("**Resumo Anual:**")
-            st.write(f"- Consumo Total: {sum(consumo_mensal):.1f} kWh/ano")
-            st.write(f"- Geração Total: {sum(resultado['geracao_mensal']):.1f} kWh/ano")
-            st.write(f"- Saldo Anual: {sum(resultado['geracao_mensal']) - sum(consumo_mensal):.1f} kWh")
-            st.write(f"- Cobertura Média: {np.mean(df_resultados['Cobertura (%)']):.1f}%")
-        
-        with col2:
-            st.write("**Fator de Desempenho do Sistema:**")
-            st.write(f"- Fator Total: {resultado['fator_desempenho']:.3f}")
-            st.write(f"- Considera perdas por temperatura, sombreamento, conversão e eficiência do inversor")
+        # Guardar resultado e entradas para as próximas execuções da página
+        st.session_state.ultimo_resultado = resultado
+        st.session_state.ultimas_entradas = (consumo_mensal, meses)
+        st.session_state.ultimos_parametros = (
+            potencia_modulo, irradiacao_solar, calcular_payback_option,
+            investimento_total, tarifa_energia, taxa_desconto
+        )
         
-        # Preparar e armazenar PDF no session_state para o botão no topo
-        resultado_payback_pdf = None
+        # Payback calculado uma única vez e reutilizado no PDF e na tela
+        resultado_payback = None
         if calcular_payback_option and investimento_total > 0 and tarifa_energia > 0:
-            resultado_payback_pdf = calcular_payback(
+            taxa_frac = taxa_desconto / 100 if taxa_desconto > 0 else 0.0
+            resultado_payback = calcular_payback(
                 resultado['geracao_mensal'],
                 consumo_mensal,
                 tarifa_energia,
                 investimento_total,
-                taxa_desconto / 100 if taxa_desconto > 0 else 0.0
+                taxa_frac
             )
+        st.session_state.ultimo_payback = resultado_payback
         
-        # Gerar PDF e armazenar
-        pdf_buffer = gerar_pdf(
-            consumo_mensal,
-            resultado,
-            meses,
-            potencia_modulo,
-            irradiacao_solar,
-            resultado_payback_pdf,
-            investimento_total if calcular_payback_option and investimento_total > 0 else 0,
-            tarifa_energia if calcular_payback_option and tarifa_energia > 0 else 0
-        )
-        st.session_state.pdf_buffer = pdf_buffer
-        st.session_state.pdf_disponivel = True
-        
-        # Atualizar botão PDF no topo
-        pdf_button_container.download_button(
-            label="Gerar Relatório",
-            data=pdf_buffer,
-            file_name="relatorio_dimensionamento_solar.pdf",
-            mime="application/pdf",
-            help="Baixar relatório completo em PDF",
+        # Novo resultado: o relatório anterior deixa de corresponder aos dados
+        st.session_state.pdf_disponivel = False
+    
+    # Relatório PDF no topo (gerado apenas quando solicitado)
+    if 'ultimo_resultado' in st.session_state:
+        if not st.session_state.pdf_disponivel and pdf_button_container.button(
+            "Preparar Relatório PDF",
+            help="Gerar o relatório completo em PDF",
             use_container_width=True,
-            key="pdf_button_top"
-        )
-        
-        # Análise de Payback
-        if calcular_payback_option and investimento_total > 0 and tarifa_energia > 0:
-            st.subheader("💰 Análise de Retorno do Investimento (Payback)")
-            
-            resultado_payback = calcular_payback(
-                resultado['geracao_mensal'],
-                consumo_mensal,
-                tarifa_energia,
-                investimento_total,
-                taxa_desconto / 100 if taxa_desconto > 0 else 0.0
+            key="pdf_preparar"
+        ):
+            consumo_pdf, meses_pdf = st.session_state.ultimas_entradas
+            (potencia_pdf, irradiacao_pdf, payback_pdf_option,
+             investimento_pdf, tarifa_pdf, _) = st.session_state.ultimos_parametros
+            st.session_state.pdf_bytes = gerar_pdf(
+                consumo_pdf,
+                st.session_state.ultimo_resultado,
+                meses_pdf,
+                potencia_pdf,
+                irradiacao_pdf,
+                st.session_state.ultimo_payback,
+                investimento_pdf if payback_pdf_option and investimento_pdf > 0 else 0,
+                tarifa_pdf if payback_pdf_option and tarifa_pdf > 0 else 0
             )
-            
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                if resultado_payback['payback_simples'] != float('inf'):
-                    anos = int(resultado_payback['payback_simples'])
-                    meses_payback = int((resultado_payback['payback_simples'] - anos) * 12)
-                    st.metric(
-                        "Payback Simples",
-                        f"{anos} anos e {meses_payback} meses",
-                        help="Tempo necessário para recuperar o investimento"
-                    )
-                else:
-                    st.metric("Payback Simples", "Não viável", help="Economia insuficiente")
-            
-            with col2:
-                st.metric(
-                    "Economia Anual",
-                    f"R$ {resultado_payback['economia_anual']:,.2f}",
-                    help="Economia anual estimada com o sistema"
-                )
-            
-            with col3:
-                st.metric(
-                    "Economia Mensal Média",
-                    f"R$ {resultado_payback['economia_mensal_media']:,.2f}",
-                    help="Economia mensal média estimada"
-                )
-            
-            with col4:
-                if resultado_payback['payback_descontado'] is not None:
-                    anos_desc = int(resultado_payback['payback_descontado'])
-                    meses_desc = int((resultado_payback['payback_descontado'] - anos_desc) * 12)
-                    st.metric(
-                        "Payback Descontado",
-                        f"{anos_desc} anos e {meses_desc} meses",
-                        help="Payback considerando taxa de desconto"
-                    )
-                elif taxa_desconto > 0:
-                    st.metric("Payback Descontado", "> 50 anos", help="Payback muito longo")
-            
-            # Gráfico de economia mensal
-            st.subheader("📊 Economia Mensal Estimada")
-            meses_nomes = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 
-                          'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-            df_economia = pd.DataFrame({
-                'Mês': meses_nomes,
-                'Economia (R$)': resultado_payback['economia_mensal']
-            })
-            
-            fig_economia = go.Figure()
-            fig_economia.add_trace(go.Bar(
-                x=meses_nomes,
-                y=resultado_payback['economia_mensal'],
-                marker_color='green',
-                opacity=0.7,
-                text=[f'R$ {val:.2f}' for val in resultado_payback['economia_mensal']],
-                textposition='outside'
-            ))
-            fig_economia.update_layout(
-                title='Economia Mensal Estimada',
-                xaxis_title='Mês',
-                yaxis_title='Economia (R$)',
-                template='plotly_white'
+            st.session_state.pdf_disponivel = True
+        
+        if st.session_state.pdf_disponivel:
+            pdf_button_container.download_button(
+                label="Gerar Relatório",
+                data=st.session_state.pdf_bytes,
+                file_name="relatorio_dimensionamento_solar.pdf",
+                mime="application/pdf",
+                help="Baixar relatório completo em PDF",
+                use_container_width=True,
+                key="pdf_button_top"
             )
-            st.plotly_chart(fig_economia, use_container_width=True)
-            
-            # Resumo financeiro
-            st.subheader("💵 Resumo Financeiro")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.write("**Investimento e Retorno:**")
-                st.write(f"- Investimento Total: R$ {investimento_total:,.2f}")
-                st.write(f"- Economia Anual: R$ {resultado_payback['economia_anual']:,.2f}")
-                if resultado_payback['payback_simples'] != float('inf'):
-                    st.write(f"- Payback: {resultado_payback['payback_simples']:.2f} anos")
-                    # Calcular economia em 25 anos (vida útil típica)
-                    economia_25_anos = resultado_payback['economia_anual'] * 25
-                    lucro_liquido = economia_25_anos - investimento_total
-                    st.write(f"- Economia em 25 anos: R$ {economia_25_anos:,.2f}")
-                    st.write(f"- Lucro Líquido (25 anos): R$ {lucro_liquido:,.2f}")
-            
-            with col2:
-                st.write("**Informações Adicionais:**")
-                st.write(f"- Tarifa de Energia: R$ {tarifa_energia:.4f}/kWh")
-                if taxa_desconto > 0:
-                    st.write(f"- Taxa de Desconto: {taxa_desconto:.2f}% ao ano")
-                    if resultado_payback['payback_descontado'] is not None:
-                        st.write(f"- Payback Descontado: {resultado_payback['payback_descontado']:.2f} anos")
-                st.write(f"- Custo por kWp: R$ {investimento_total / (resultado['potencia_total'] / 1000):,.2f}/kWp")
+    
+    # Resultados do último cálculo
+    if 'ultimo_resultado' in st.session_state:
+        _render_resultados()
+        _render_payback()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,94 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba é opcional: sem ele os núcleos rodam em Python puro
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Núcleo numérico do consumo médio
+@njit(cache=True)
+def consumo_medio(consumo):
+    """Calcula o consumo médio mensal (kWh) a partir do array float64 de consumos"""
+    total = 0.0
+    for i in range(consumo.shape[0]):
+        total += consumo[i]
+    return total / consumo.shape[0]
+
+
+# Dimensionamento a partir do consumo médio (depende apenas de quatro escalares)
+@lru_cache(maxsize=256)
+def dimensionar(consumo_medio_mensal, potencia_modulo, irradiacao_solar, fator_desempenho):
+    """
+    Calcula o número de módulos para atender a demanda média mensal
+
+    Parâmetros:
+    - consumo_medio_mensal: consumo médio mensal (kWh)
+    - potencia_modulo: potência do módulo em Wp
+    - irradiacao_solar: valor único de irradiação solar (kWh/m²)
+    - fator_desempenho: produto dos fatores de perda do sistema
+
+    Retorna:
+    - numero_modulos, geracao_mensal (kWh/mês do sistema)
+    """
+    # Geração mensal por módulo (kWh/mês)
+    geracao_mensal_modulo = (potencia_modulo / 1000.0) * irradiacao_solar * fator_desempenho * 30.0
+
+    numero_modulos = math.ceil(consumo_medio_mensal / geracao_mensal_modulo)
+    return numero_modulos, geracao_mensal_modulo * numero_modulos
+
+
+# Núcleo numérico do payback
+@njit(cache=True)
+def payback(geracao, consumo, tarifa_energia, investimento_total, taxa_desconto):
+    """
+    Calcula economia mensal, payback simples e payback descontado
+
+    Parâmetros:
+    - geracao: array float64 com geração de cada mês (kWh)
+    - consumo: array float64 com consumo de cada mês (kWh)
+    - tarifa_energia: tarifa de energia em R$/kWh
+    - investimento_total: investimento total do sistema em R$
+    - taxa_desconto: taxa de desconto anual (fração, 0.0 para não descontar)
+
+    Retorna:
+    - payback_simples (anos, inf se não houver economia)
+    - payback_descontado (anos, NaN se não calculado ou acima de 50 anos)
+    - economia_mensal (array em R$)
+    """
+    n = geracao.shape[0]
+
+    # Economia é a menor entre geração e consumo (não economiza no excedente)
+    economia = np.empty(n)
+    economia_anual = 0.0
+    for i in range(n):
+        economia[i] = min(geracao[i], consumo[i]) * tarifa_energia
+        economia_anual += economia[i]
+
+    # Payback simples: investimento / economia anual
+    if economia_anual > 0:
+        payback_simples = investimento_total / economia_anual
+    else:
+        payback_simples = np.inf
+
+    # Payback descontado: primeiro mês em que o valor presente acumulado cobre o investimento
+    payback_descontado = np.nan
+    if taxa_desconto > 0 and economia_anual > 0:
+        taxa_mensal = taxa_desconto / 12
+        horizonte = 50 * 12  # Limite de 50 anos
+        valor_presente_acumulado = 0.0
+        meses = 0
+        while valor_presente_acumulado < investimento_total and meses < horizonte:
+            meses += 1
+            # Repetir padrão anual
+            valor_presente_acumulado += economia[(meses - 1) % n] / ((1 + taxa_mensal) ** meses)
+        if meses < horizonte:
+            payback_descontado = meses / 12
+
+    return payback_simples, payback_descontado, economia